@@ -5,14 +5,18 @@ A user-friendly web interface for getting business recommendations
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 from recommendation_engine import BusinessRecommendationEngine
+from functools import lru_cache
+import hashlib
+import html
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
+# On-disk cache for data derived from the dataset (keyed by the dataset's content hash)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
 # Page configuration
 st.set_page_config(
     page_title="Business Recommendation System",
@@ -22,7 +26,8 @@ st.set_page_config(
 )
 
 # Custom CSS for modern clean theme similar to Qoder
-st.markdown("""
+# Built once at import time and injected at the top of every run from main()
+_CSS_HTML = """
 <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500;600&display=swap');
@@ -255,7 +260,8 @@ st.markdown("""
     }
     
     /* Button styling - Royal cream glow buttons */
-    .stButton > button {
+    .stButton > button,
+    .stFormSubmitButton > button {
         background-color: #000000 !important;
         color: #F5E8C9 !important;
         border: 1px solid #F5E8C9 !important;
@@ -268,7 +274,8 @@ st.markdown("""
         box-shadow: 0 0 10px rgba(245, 232, 201, 0.2);
     }
     
-    .stButton > button:hover {
+    .stButton > button:hover,
+    .stFormSubmitButton > button:hover {
         background-color: #111111 !important;
         border-color: #F5E8C9 !important;
         box-shadow: 0 0 20px rgba(245, 232, 201, 0.4);
@@ -429,25 +436,336 @@ st.markdown("""
         color: #D4C8B0 !important;
         font-style: italic !important;
     }
+    
+    /* Intro panel - Royal cream glow banner */
+    .intro-panel {
+        text-align: center;
+        background-color: #000000;
+        padding: 2rem;
+        border-radius: 8px;
+        margin-bottom: 2rem;
+        border: 1px solid #F5E8C9;
+        box-shadow: 0 0 20px rgba(245, 232, 201, 0.1);
+    }
+    
+    .intro-panel .intro-title-row {
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-bottom: 1.2rem;
+    }
+    
+    .intro-panel .intro-icon {
+        width: 60px;
+        height: 60px;
+        border-radius: 50%;
+        background: linear-gradient(135deg, #F5E8C9, #D4C8B0);
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-right: 1rem;
+        box-shadow: 0 0 15px rgba(245, 232, 201, 0.5);
+    }
+    
+    .intro-panel .intro-icon span {
+        color: #000000;
+        font-size: 1.5rem;
+        font-weight: bold;
+        text-shadow: 0 0 5px rgba(0, 0, 0, 0.5);
+    }
+    
+    .intro-panel .intro-title {
+        margin: 0;
+        color: #F5E8C9;
+        font-weight: 600;
+        font-size: 1.5rem;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);
+    }
+    
+    .intro-panel .intro-subtitle {
+        margin: 0;
+        color: #D4C8B0;
+        font-weight: 400;
+        font-size: 1rem;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);
+    }
+    
+    .intro-panel .intro-text {
+        font-size: 1rem;
+        color: #F5E8C9;
+        font-weight: 400;
+        line-height: 1.6;
+        margin: 0;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);
+    }
+    
+    .intro-panel .intro-text strong {
+        color: #F5E8C9;
+        text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);
+    }
+    
+    /* ML prediction card - Royal cream glow analysis panel */
+    .prediction-card {
+        background: linear-gradient(135deg, rgba(0, 0, 0, 0.95) 0%, rgba(20, 20, 20, 0.9) 50%, rgba(0, 0, 0, 0.95) 100%);
+        padding: 2.5rem;
+        border-radius: 20px;
+        margin: 2rem 0;
+        border: 2px solid rgba(245, 232, 201, 0.5);
+        box-shadow: 0 20px 50px rgba(0, 0, 0, 0.8), 0 0 50px rgba(245, 232, 201, 0.3);
+        position: relative;
+    }
+    
+    .prediction-card .prediction-accent {
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        height: 4px;
+        background: linear-gradient(90deg, #F5E8C9, #D4C8B0, #F5E8C9);
+        background-size: 300% 100%;
+        border-radius: 20px 20px 0 0;
+    }
+    
+    .prediction-card .prediction-heading {
+        color: #F5E8C9;
+        margin-bottom: 1.5rem;
+        font-weight: 800;
+        font-size: 1.6rem;
+        display: flex;
+        align-items: center;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 20px rgba(245, 232, 201, 0.8);
+        letter-spacing: 2px;
+    }
+    
+    .prediction-card .prediction-icon {
+        margin-right: 1rem;
+        color: #F5E8C9;
+    }
+    
+    .prediction-card .prediction-title {
+        background: linear-gradient(45deg, #F5E8C9, #D4C8B0);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+    }
+    
+    .prediction-card .prediction-grid {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        gap: 1.5rem;
+        margin-bottom: 1.5rem;
+    }
+    
+    .prediction-card .prediction-panel {
+        background: linear-gradient(135deg, rgba(245, 232, 201, 0.2) 0%, rgba(245, 232, 201, 0.1) 100%);
+        padding: 1.5rem;
+        border-radius: 12px;
+        border: 2px solid rgba(245, 232, 201, 0.5);
+        box-shadow: 0 8px 25px rgba(245, 232, 201, 0.3);
+    }
+    
+    .prediction-card > .prediction-panel:not(:last-child) {
+        margin-bottom: 1.5rem;
+    }
+    
+    .prediction-card .prediction-panel strong {
+        color: #F5E8C9;
+        font-size: 1.1rem;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);
+    }
+    
+    .prediction-card .prediction-value {
+        color: #F5E8C9;
+        font-weight: 800;
+        font-size: 1.5rem;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 20px rgba(245, 232, 201, 0.8);
+        letter-spacing: 1px;
+    }
+    
+    .prediction-card .prediction-text {
+        color: #F5E8C9;
+        font-weight: 400;
+        font-size: 1.1rem;
+        line-height: 1.6;
+        font-family: 'Inter', sans-serif;
+        text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-@st.cache_data
+@st.cache_resource(show_spinner="Loading Business Recommendation System...")
 def load_recommendation_engine():
     """Load and cache the recommendation engine."""
-    return BusinessRecommendationEngine(use_ml=True)
+    engine = BusinessRecommendationEngine(use_ml=True)
+    
+    # City -> position lookup for the city selectbox
+    engine.city_index = {city: i for i, city in enumerate(engine.get_available_cities())}
+    
+    # Precompute the City x Category market score matrix once, so the
+    # heatmap only has to select columns per request
+    engine.score_matrix = load_score_matrix(engine.df, engine.dataset_path)
+    
+    return engine
 
-def get_score_color_class(score):
-    """Get CSS class based on score value."""
-    if score >= 80:
-        return "score-excellent"
-    elif score >= 65:
-        return "score-good"
-    elif score >= 50:
-        return "score-average"
-    else:
-        return "score-poor"
+# Static footer markup, shared by every run
+FOOTER_HTML = """
+<div class="footer-text">
+    <div style="display: flex; align-items: center; justify-content: center; margin-bottom: 0.5rem;">
+        <span style="font-size: 1.4rem; margin-right: 0.8rem;">🚀</span>
+        <strong style="color: #F5E8C9; font-family: 'Inter', sans-serif;
+                       font-weight: 600; letter-spacing: 0px; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">Business Intelligence</strong>
+    </div>
+    <div style="font-size: 0.9rem; opacity: 0.9; color: #D4C8B0; font-family: 'Inter', sans-serif;
+                letter-spacing: 0px; text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);">
+        Advanced Analytics | Data Insights | Smart Decisions
+    </div>
+    <div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #F5E8C9;
+                font-size: 0.8rem; color: #D4C8B0; font-family: 'Inter', sans-serif; text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);">
+        <span style="opacity: 0.8;">Developed by</span> 
+        <strong style="color: #F5E8C9; font-weight: 500; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">Sudev Basti</strong>
+    </div>
+</div>
+"""
+
+_PREDICTION_CARD_TEMPLATE = """
+<div class="prediction-card">
+    <div class="prediction-accent"></div>
+    <h3 class="prediction-heading">
+        <span class="prediction-icon">🚀</span>
+        <span class="prediction-title">QUANTUM ANALYSIS: "{business_name}"</span>
+    </h3>
+    <div class="prediction-grid">
+        <div class="prediction-panel">
+            <strong>CONFIDENCE:</strong><br>
+            <span class="prediction-value" style="color: {confidence_color}; text-shadow: 0 0 20px {confidence_color};">
+                {confidence:.1%} ({prediction_quality})
+            </span>
+        </div>
+        <div class="prediction-panel">
+            <strong>MARKET GAP:</strong><br>
+            <span class="prediction-value">{market_gap} POINTS</span>
+        </div>
+    </div>
+    <div class="prediction-panel">
+        <strong>STELLAR ANALYSIS:</strong><br>
+        <span class="prediction-text">{interpretation}</span>
+    </div>
+    <div class="prediction-panel">
+        <strong>COSMIC RECOMMENDATION:</strong><br>
+        <span class="prediction-text">{recommendation}</span>
+    </div>
+</div>
+"""
+
+_REC_CARD_TEMPLATE = """
+<div class="recommendation-card">
+    <h3 style="color: #F5E8C9; margin-bottom: 0.8rem; font-family: 'Inter', sans-serif;
+               text-shadow: 0 0 20px rgba(245, 232, 201, 0.8); letter-spacing: 1px;">
+        {rank}. {business_name} 
+        <span style="font-size: 0.8em; color: #D4C8B0;">({category})</span>
+    </h3>
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1.2rem;">
+        <span style="font-size: 1.3rem; font-weight: 600; color: #F5E8C9; font-family: 'Inter', sans-serif;
+                     text-shadow: 0 0 15px rgba(245, 232, 201, 0.6);">
+            💰 Investment: {investment_str}
+        </span>
+        <span class="{score_class}" style="font-size: 1.3rem;">
+            Score: {score}%
+        </span>
+    </div>
+    <div style="margin-bottom: 1.2rem; color: #D4C8B0; font-family: 'Inter', sans-serif;
+                text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">
+        <strong>📈 Market Analysis:</strong> 
+        Demand: {demand:g}% | Competition: {competition:g}% | 
+        Market Gap: {market_gap:.1f} points
+    </div>
+    <div style="background: linear-gradient(135deg, rgba(245, 232, 201, 0.1) 0%, rgba(212, 200, 176, 0.1) 100%); 
+                padding: 1.2rem; border-radius: 10px; border-left: 4px solid #F5E8C9;
+                box-shadow: 0 8px 20px rgba(245, 232, 201, 0.2);">
+        <strong style="color: #F5E8C9; font-family: 'Inter', sans-serif;
+                       text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);">💡 Business Intelligence:</strong><br>
+        <span style="color: #F5E8C9; font-family: 'Inter', sans-serif; line-height: 1.6;
+                     text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">{explanation}</span>
+    </div>
+</div>
+"""
+
+def compute_score_matrix(df):
+    """
+    Compute the City x Category market score matrix (avg demand - avg competition).
+    
+    Accumulates sums and counts per cell in a single pass over the categorical
+    codes; cells without businesses score 0.
+    """
+    cities = df['City'].cat.categories
+    categories = df['Category'].cat.categories
+    n_cells = len(cities) * len(categories)
+    
+    cell = df['City'].cat.codes.to_numpy(np.int64) * len(categories) + df['Category'].cat.codes.to_numpy(np.int64)
+    gap = df['Demand'].to_numpy(np.float64) - df['Competition'].to_numpy(np.float64)
+    sums = np.bincount(cell, weights=gap, minlength=n_cells)
+    counts = np.bincount(cell, minlength=n_cells)
+    scores = (sums / np.maximum(counts, 1)).reshape(len(cities), len(categories))
+    
+    return pd.DataFrame(
+        scores.astype(np.float32),
+        index=pd.Index(cities, name='City'),
+        columns=pd.Index(categories, name='Category')
+    )
+
+def load_score_matrix(df, dataset_path):
+    """Load the score matrix from the disk cache, computing and caching it on a miss."""
+    with open(dataset_path, 'rb') as f:
+        cache_key = hashlib.md5(f.read()).hexdigest()[:12]
+    cache_path = os.path.join(CACHE_DIR, f"score_{cache_key}.parquet")
+    
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            print(f"⚠️ Could not read cached score matrix, recomputing: {str(e)}")
+    
+    score_matrix = compute_score_matrix(df)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        score_matrix.to_parquet(cache_path, compression='zstd')
+    except Exception as e:
+        print(f"⚠️ Could not cache score matrix: {str(e)}")
+    
+    return score_matrix
+
+@st.cache_data(show_spinner=False)
+def render_prediction_card(business_name, confidence, prediction_quality, market_gap,
+                           interpretation, recommendation):
+    """Fill the ML prediction card template (cached per business name and prediction)."""
+    confidence_color = "#00FF88" if confidence > 0.8 else "#FFD700" if confidence > 0.6 else "#FF6B6B"
+    
+    return _PREDICTION_CARD_TEMPLATE.format(
+        business_name=html.escape(business_name),
+        confidence_color=confidence_color,
+        confidence=confidence,
+        prediction_quality=prediction_quality,
+        market_gap=market_gap,
+        interpretation=interpretation,
+        recommendation=recommendation
+    )
+
+# Score thresholds and the CSS class for each bucket between them
+_SCORE_EDGES = np.array([50, 65, 80])
+_SCORE_CLASSES = ("score-poor", "score-average", "score-good", "score-excellent")
+
+def get_score_color_classes(scores):
+    """Get CSS classes for a sequence of scores in one lookup."""
+    idx = np.searchsorted(_SCORE_EDGES, np.fromiter(scores, dtype=float), side='right')
+    return [_SCORE_CLASSES[i] for i in idx]
 
+@lru_cache(maxsize=4096, typed=True)
 def format_currency(amount):
     """Format currency in Indian format."""
     if amount >= 10000000:  # 1 crore
@@ -457,56 +775,242 @@ def format_currency(amount):
     else:
         return f"₹{amount:,}"
 
-def create_opportunity_heatmap(engine, selected_interests, top_cities=15):
-    """Create opportunity heatmap data for top cities and categories."""
+@st.cache_data(show_spinner=False)
+def get_cached_recommendations(_engine, city, budget, interests, top_n):
+    """Get recommendations, cached per (city, budget, interests, top_n); pass interests as a sorted tuple.
+    
+    Each recommendation also carries its display strings (_short_name,
+    _investment_str, _score_class) so reruns don't rebuild them.
+    """
+    recommendations = _engine.get_recommendations(city, budget, list(interests), top_n)
+    score_classes = get_score_color_classes(rec['score'] for rec in recommendations)
+    for rec, score_class in zip(recommendations, score_classes):
+        name = rec['business_name']
+        rec['_short_name'] = name[:15] + "..." if len(name) > 15 else name
+        rec['_investment_str'] = format_currency(rec['investment_required'])
+        rec['_score_class'] = score_class
+    return recommendations
+
+@st.cache_data(show_spinner=False)
+def get_cached_category_analysis(_engine, city):
+    """Get the category analysis for a city, cached per city."""
+    return _engine.get_category_analysis(city)
+
+@st.cache_data(show_spinner=False)
+def get_cached_city_summaries(_engine, cities):
+    """Get the summary statistics for several cities in one cached call.
+    
+    Pass cities as a tuple; cities without data are skipped.
+    """
+    summaries = []
+    for city in cities:
+        summary = _engine.get_city_summary(city)
+        if summary:
+            summaries.append(dict(summary, city=city))
+    return summaries
+
+def build_comparison_df(engine, cities):
+    """Build the city comparison table, or None if none of the cities have data."""
+    summaries = get_cached_city_summaries(engine, cities)
+    if not summaries:
+        return None
+    
+    summary_df = pd.DataFrame.from_records(summaries)
+    return pd.DataFrame({
+        'City': summary_df['city'],
+        'Total Businesses': summary_df['total_businesses'],
+        'Avg Demand': summary_df['avg_demand'],
+        'Avg Competition': summary_df['avg_competition'],
+        'Market Gap': (summary_df['avg_demand'] - summary_df['avg_competition']).round(1),
+        'Avg Investment (₹L)': (summary_df['avg_investment'] / 100000).round(1),
+        'Popular Category': summary_df['top_category']
+    })
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def create_opportunity_heatmap(_engine, selected_interests, top_cities=15):
+    """Create opportunity heatmap data for top cities and categories.
+    
+    Cached per (selected_interests, top_cities); pass interests as a sorted tuple.
+    The engine argument is underscore-prefixed so Streamlit doesn't hash it.
+    """
     try:
-        # Get all cities and calculate market scores
-        cities = engine.get_available_cities()
-        categories = selected_interests if selected_interests else engine.get_available_categories()
-        
-        heatmap_data = []
-        
-        for city in cities:
-            city_scores = []
-            for category in categories:
-                # Get category data for the city
-                city_category_data = engine.df[
-                    (engine.df['City'] == city) & (engine.df['Category'] == category)
-                ]
-                
-                if not city_category_data.empty:
-                    avg_demand = city_category_data['Demand'].mean()
-                    avg_competition = city_category_data['Competition'].mean()
-                    market_score = avg_demand - avg_competition
-                    city_scores.append(market_score)
-                else:
-                    city_scores.append(0)  # No data available
-            
-            # Calculate average score for the city
-            avg_city_score = np.mean(city_scores) if city_scores else 0
-            heatmap_data.append({
-                'city': city,
-                'avg_score': avg_city_score,
-                **{f'{cat}': score for cat, score in zip(categories, city_scores)}
-            })
-        
-        # Convert to DataFrame and select top cities
-        df_heatmap = pd.DataFrame(heatmap_data)
-        df_heatmap = df_heatmap.sort_values('avg_score', ascending=False).head(top_cities)
+        # Market scores come from the matrix precomputed at engine load;
+        # with no interests selected the full matrix is used as-is
+        if selected_interests:
+            market_scores = _engine.score_matrix.reindex(columns=list(selected_interests)).fillna(0)  # No data available -> 0
+        else:
+            market_scores = _engine.score_matrix
         
-        # Create the heatmap matrix
-        heatmap_matrix = df_heatmap.set_index('city')[categories]
+        # Select top cities by their average score across the chosen categories
+        avg_city_scores = market_scores.mean(axis=1)
+        heatmap_matrix = market_scores.loc[avg_city_scores.nlargest(top_cities).index]
         
-        return heatmap_matrix
+        # One contiguous float32 block: half the bytes to pickle, cache and style
+        return pd.DataFrame(
+            np.ascontiguousarray(heatmap_matrix.to_numpy(dtype=np.float32)),
+            index=heatmap_matrix.index,
+            columns=heatmap_matrix.columns
+        )
         
     except Exception as e:
         print(f"Error creating heatmap: {str(e)}")
         return pd.DataFrame()
 
+def heatmap_cell_styles(heatmap_data):
+    """Map each heatmap cell onto the cream color scale (light = high opportunity)."""
+    values = heatmap_data.to_numpy(dtype=np.float32, copy=False)
+    low, high = np.nanmin(values), np.nanmax(values)
+    scaled = (values - low) / (high - low) if high > low else np.full(values.shape, 0.5)
+    
+    # Same color stops as the Plotly charts: #8B7D6B -> #D4C8B0 -> #F5E8C9
+    stops = np.array([0.0, 0.5, 1.0])
+    stop_colors = np.array([[0x8B, 0x7D, 0x6B], [0xD4, 0xC8, 0xB0], [0xF5, 0xE8, 0xC9]])
+    rgb = np.stack(
+        [np.interp(scaled, stops, stop_colors[:, channel]) for channel in range(3)], axis=-1
+    ).round().astype(int)
+    
+    styles = [[f"background-color: #{r:02X}{g:02X}{b:02X}; color: #000000" for r, g, b in row] for row in rgb]
+    return pd.DataFrame(styles, index=heatmap_data.index, columns=heatmap_data.columns)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def budget_figure(business_names, investments, budget):
+    """Build the investment vs budget bar chart, cached per input as a figure dict."""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    
+    # Budget line
+    fig.add_hline(y=budget, line_dash="dash", line_color="#FF6B6B",
+                 annotation_text=f"Your Budget: {format_currency(budget)}")
+    
+    # Investment bars
+    fig.add_trace(go.Bar(
+        x=list(business_names),
+        y=list(investments),
+        name="Required Investment",
+        marker_color=np.where(np.asarray(investments) <= budget, '#00E5FF', '#FF6B6B').tolist()
+    ))
+    
+    fig.update_layout(
+        title="Investment vs Your Budget",
+        xaxis_title="Business",
+        yaxis_title="Amount (₹)",
+        height=400,
+        showlegend=False,
+        plot_bgcolor='rgba(0, 0, 0, 0.9)',
+        paper_bgcolor='rgba(0, 0, 0, 0.9)',
+        font=dict(family='Inter', color='#F5E8C9')
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def category_figures(city, categories, market_gaps, business_counts, avg_investments):
+    """Build the market gap bar chart and investment scatter for a city's categories."""
+    import plotly.graph_objects as go
+    
+    categories = list(categories)
+    market_gaps = list(market_gaps)
+    
+    fig_gap = go.Figure(go.Bar(
+        x=categories,
+        y=market_gaps,
+        marker=dict(
+            color=market_gaps,
+            colorscale=[[0, '#8B7D6B'], [0.5, '#D4C8B0'], [1, '#F5E8C9']],
+            showscale=True
+        )
+    ))
+    fig_gap.update_layout(
+        title=f"Market Opportunity by Category in {city}",
+        xaxis_title='Category',
+        yaxis_title='Market Gap (Demand - Competition)',
+        height=400, 
+        showlegend=False,
+        plot_bgcolor='rgba(0, 0, 0, 0.9)',
+        paper_bgcolor='rgba(0, 0, 0, 0.9)',
+        font=dict(family='Inter', color='#F5E8C9')
+    )
+    
+    # One trace per category so each gets its own legend entry and color
+    palette = ['#F5E8C9', '#D4C8B0', '#B8A890', '#A09078', '#8B7D6B', '#706550']
+    size_ref = 2.0 * max(max(market_gaps), 1e-9) / (20 ** 2)
+    fig_scatter = go.Figure()
+    for i, (cat, count, investment, gap) in enumerate(
+            zip(categories, business_counts, avg_investments, market_gaps)):
+        fig_scatter.add_trace(go.Scatter(
+            x=[count],
+            y=[investment],
+            mode='markers',
+            name=cat,
+            marker=dict(color=palette[i % len(palette)], size=[gap],
+                        sizemode='area', sizeref=size_ref, sizemin=0),
+            customdata=[[cat, gap]],
+            hovertemplate=('Categories=%{customdata[0]}<br>Number of Businesses=%{x}<br>'
+                           'Average Investment (₹)=%{y}<br>Market_Gap=%{customdata[1]}<extra></extra>')
+        ))
+    fig_scatter.update_layout(
+        title="Investment vs Market Size by Category",
+        xaxis_title='Number of Businesses',
+        yaxis_title='Average Investment (₹)',
+        legend_title_text='Categories',
+        height=400,
+        plot_bgcolor='rgba(0, 0, 0, 0.9)',
+        paper_bgcolor='rgba(0, 0, 0, 0.9)',
+        font=dict(family='Inter', color='#F5E8C9')
+    )
+    return fig_gap.to_dict(), fig_scatter.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def comparison_figures(comparison_df):
+    """Build the market gap and average investment comparison charts."""
+    import plotly.graph_objects as go
+    
+    fig_demand_comp = go.Figure(go.Bar(
+        x=comparison_df['City'],
+        y=comparison_df['Market Gap'],
+        marker=dict(
+            color=comparison_df['Market Gap'],
+            colorscale=[[0, '#8B7D6B'], [0.5, '#D4C8B0'], [1, '#F5E8C9']],
+            showscale=True
+        )
+    ))
+    fig_demand_comp.update_layout(
+        title="Market Gap Comparison",
+        xaxis_title='City',
+        yaxis_title='Market Gap',
+        height=400, 
+        showlegend=False,
+        plot_bgcolor='rgba(0, 0, 0, 0.9)',
+        paper_bgcolor='rgba(0, 0, 0, 0.9)',
+        font=dict(family='Inter', color='#F5E8C9')
+    )
+    
+    fig_investment_comp = go.Figure(go.Bar(
+        x=comparison_df['City'],
+        y=comparison_df['Avg Investment (₹L)'],
+        marker=dict(
+            color=comparison_df['Avg Investment (₹L)'],
+            colorscale=[[0, '#8B7D6B'], [1, '#F5E8C9']],
+            showscale=True
+        )
+    ))
+    fig_investment_comp.update_layout(
+        title="Average Investment Comparison",
+        xaxis_title='City',
+        yaxis_title='Avg Investment (₹L)',
+        height=400, 
+        showlegend=False,
+        plot_bgcolor='rgba(0, 0, 0, 0.9)',
+        paper_bgcolor='rgba(0, 0, 0, 0.9)',
+        font=dict(family='Inter', color='#F5E8C9')
+    )
+    return fig_demand_comp.to_dict(), fig_investment_comp.to_dict()
+
 def main():
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
+    
     # Load the recommendation engine
-    with st.spinner("Loading Business Recommendation System..."):
-        engine = load_recommendation_engine()
+    engine = load_recommendation_engine()
     
     # Main header with modern clean design
     st.markdown('<div class="main-header">📊 Business Intelligence</div>', 
@@ -514,30 +1018,17 @@ def main():
     
     # Modern professional description
     st.markdown("""
-    <div style="text-align: center; background-color: #000000; 
-                padding: 2rem; border-radius: 8px; margin-bottom: 2rem; 
-                border: 1px solid #F5E8C9; box-shadow: 0 0 20px rgba(245, 232, 201, 0.1);">
-        <div style="display: flex; align-items: center; justify-content: center; margin-bottom: 1.2rem;">
-            <div style="width: 60px; height: 60px; border-radius: 50%; 
-                        background: linear-gradient(135deg, #F5E8C9, #D4C8B0); 
-                        display: flex; align-items: center; justify-content: center; margin-right: 1rem; box-shadow: 0 0 15px rgba(245, 232, 201, 0.5);">
-                <span style="color: #000000; font-size: 1.5rem; font-weight: bold; text-shadow: 0 0 5px rgba(0, 0, 0, 0.5);">💼</span>
-            </div>
+    <div class="intro-panel">
+        <div class="intro-title-row">
+            <div class="intro-icon"><span>💼</span></div>
             <div>
-                <h2 style="margin: 0; color: #F5E8C9; font-weight: 600; font-size: 1.5rem;
-                           font-family: 'Inter', sans-serif; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">
-                    Business Intelligence
-                </h2>
-                <p style="margin: 0; color: #D4C8B0; font-weight: 400; font-size: 1rem;
-                         font-family: 'Inter', sans-serif; text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);">
-                    Advanced Analytics & Market Insights
-                </p>
+                <h2 class="intro-title">Business Intelligence</h2>
+                <p class="intro-subtitle">Advanced Analytics & Market Insights</p>
             </div>
         </div>
-        <p style="font-size: 1rem; color: #F5E8C9; font-weight: 400; line-height: 1.6; margin: 0;
-                  font-family: 'Inter', sans-serif; text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);">
-            Intelligent algorithms analyze <strong style="color: #F5E8C9; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">30,000+ business opportunities</strong> 
-            across <strong style="color: #F5E8C9; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">50+ strategic markets</strong>
+        <p class="intro-text">
+            Intelligent algorithms analyze <strong>30,000+ business opportunities</strong> 
+            across <strong>50+ strategic markets</strong>
         </p>
     </div>
     """, unsafe_allow_html=True)
@@ -582,7 +1073,7 @@ Each business idea gets a Smart Score (0-100).
 - **Budget Fit (30%)**: Can you afford it?
 - **Interest Match (20%)**: Does it align with what you like?
 
-Our system (Random Forest) works like 30,000+ experts giving advice.
+Our system (Gradient Boosting) learns from 30,000+ real examples, one small correction at a time.
 It helps us predict:
 - How much customers will want each business
 - How much competition there will be
@@ -595,116 +1086,119 @@ Think of it as having a crystal ball backed by real data!
     st.markdown('<div class="sub-header">⚙️ Configure Your Search</div>', 
                 unsafe_allow_html=True)
     
-    # Create columns for settings in main page
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        # City selection
-        cities = engine.get_available_cities()
-        if 'selected_city' not in st.session_state:
-            st.session_state.selected_city = "Mumbai" if "Mumbai" in cities else cities[0] if cities else ""
-        selected_city = st.selectbox(
-            "📍 Select Your City",
-            cities,
-            index=cities.index(st.session_state.selected_city) if st.session_state.selected_city in cities else 0,
-            help="Choose the city where you want to start your business",
-            placeholder="Select your city...",
-            key="city_select"
-        )
-        st.session_state.selected_city = selected_city
-    
-    with col2:
-        # Budget input
-        min_investment, max_investment = engine.get_investment_range()
-        if 'budget' not in st.session_state:
-            st.session_state.budget = 3000000
-        budget = st.slider(
-            "💰 Your Budget (₹)",
-            min_value=min_investment,
-            max_value=max_investment,
-            value=st.session_state.budget,
-            step=100000,
-            format="₹%d",
-            help="Select your available investment budget",
-            key="budget_slider"
-        )
-        st.session_state.budget = budget
-    
-    with col3:
-        # Interest selection
-        categories = engine.get_available_categories()
-        if 'selected_interests' not in st.session_state:
-            st.session_state.selected_interests = ["Food", "Tech"]
-        selected_interests = st.multiselect(
-            "❤️ Your Interests",
-            categories,
-            default=st.session_state.selected_interests,
-            help="Select business categories that interest you",
-            placeholder="Select your interests...",
-            key="interests_select"
-        )
-        st.session_state.selected_interests = selected_interests
-    
-    with col4:
-        # Number of recommendations
-        if 'num_recommendations' not in st.session_state:
-            st.session_state.num_recommendations = 3
-        num_recommendations = st.slider(
-            "📊 Number of Recommendations",
-            min_value=1,
-            max_value=10,
-            value=st.session_state.num_recommendations,
-            help="How many business recommendations would you like to see?",
-            key="num_recommendations_slider"
-        )
-        st.session_state.num_recommendations = num_recommendations
-    
-    # Advanced AI Features Section
-    st.markdown('<div class="sub-header">🤖 Analytics Engine</div>', 
-                unsafe_allow_html=True)
-    
-    col5, col6 = st.columns([1, 2])
-    
-    with col5:
-        if 'enable_ml' not in st.session_state:
-            st.session_state.enable_ml = True
-        enable_ml = st.checkbox(
-            "Enable ML Predictions",
-            value=st.session_state.enable_ml,
-            help="Use machine learning for enhanced demand and competition predictions",
-            key="ml_checkbox"
-        )
-        st.session_state.enable_ml = enable_ml
-    
-    with col6:
-        # Prediction for new business
-        if 'predict_business_name' not in st.session_state:
-            st.session_state.predict_business_name = ""
-        predict_business_name = st.text_input(
-            "🔮 Predict New Business Name",
-            value=st.session_state.predict_business_name,
-            placeholder="e.g., Tech Solutions Hub, Green Cafe Express...",
-            help="Enter name for your new business idea",
-            key="business_name_input"
-        )
-        st.session_state.predict_business_name = predict_business_name
+    # Batch all settings in a form so tweaking a widget doesn't rerun the app;
+    # the script only reruns when one of the submit buttons is pressed
+    with st.form("search_form"):
+        # Create columns for settings in main page
+        col1, col2, col3, col4 = st.columns(4)
+    
+        with col1:
+            # City selection
+            cities = engine.get_available_cities()
+            if 'selected_city' not in st.session_state:
+                st.session_state.selected_city = "Mumbai" if "Mumbai" in cities else cities[0] if cities else ""
+            selected_city = st.selectbox(
+                "📍 Select Your City",
+                cities,
+                index=engine.city_index.get(st.session_state.selected_city, 0),
+                help="Choose the city where you want to start your business",
+                placeholder="Select your city...",
+                key="city_select"
+            )
+            st.session_state.selected_city = selected_city
+    
+        with col2:
+            # Budget input
+            min_investment, max_investment = engine.get_investment_range()
+            if 'budget' not in st.session_state:
+                st.session_state.budget = 3000000
+            budget = st.slider(
+                "💰 Your Budget (₹)",
+                min_value=min_investment,
+                max_value=max_investment,
+                value=st.session_state.budget,
+                step=100000,
+                format="₹%d",
+                help="Select your available investment budget",
+                key="budget_slider"
+            )
+            st.session_state.budget = budget
+    
+        with col3:
+            # Interest selection
+            categories = engine.get_available_categories()
+            if 'selected_interests' not in st.session_state:
+                st.session_state.selected_interests = ["Food", "Tech"]
+            selected_interests = st.multiselect(
+                "❤️ Your Interests",
+                categories,
+                default=st.session_state.selected_interests,
+                help="Select business categories that interest you",
+                placeholder="Select your interests...",
+                key="interests_select"
+            )
+            st.session_state.selected_interests = selected_interests
+    
+        with col4:
+            # Number of recommendations
+            if 'num_recommendations' not in st.session_state:
+                st.session_state.num_recommendations = 3
+            num_recommendations = st.slider(
+                "📊 Number of Recommendations",
+                min_value=1,
+                max_value=10,
+                value=st.session_state.num_recommendations,
+                help="How many business recommendations would you like to see?",
+                key="num_recommendations_slider"
+            )
+            st.session_state.num_recommendations = num_recommendations
+    
+        # Advanced AI Features Section
+        st.markdown('<div class="sub-header">🤖 Analytics Engine</div>', 
+                    unsafe_allow_html=True)
+    
+        col5, col6 = st.columns([1, 2])
+    
+        with col5:
+            if 'enable_ml' not in st.session_state:
+                st.session_state.enable_ml = True
+            enable_ml = st.checkbox(
+                "Enable ML Predictions",
+                value=st.session_state.enable_ml,
+                help="Use machine learning for enhanced demand and competition predictions",
+                key="ml_checkbox"
+            )
+            st.session_state.enable_ml = enable_ml
+    
+        with col6:
+            # Prediction for new business
+            if 'predict_business_name' not in st.session_state:
+                st.session_state.predict_business_name = ""
+            predict_business_name = st.text_input(
+                "🔮 Predict New Business Name",
+                value=st.session_state.predict_business_name,
+                placeholder="e.g., Tech Solutions Hub, Green Cafe Express...",
+                help="Enter name for your new business idea",
+                key="business_name_input"
+            )
+            st.session_state.predict_business_name = predict_business_name
     
-    # Buttons
-    col7, col8 = st.columns(2)
+        # Buttons
+        col7, col8 = st.columns(2)
     
-    with col7:
-        get_recommendations = st.button(
-            "🚀 Get Recommendations",
-            type="primary",
-            use_container_width=True
-        )
+        with col7:
+            get_recommendations = st.form_submit_button(
+                "🚀 Get Recommendations",
+                type="primary",
+                use_container_width=True
+            )
     
-    with col8:
-        predict_new_business = st.button(
-            "🔮 Predict New Business",
-            use_container_width=True,
-            help="Get ML prediction for your new business idea"
-        )
+        with col8:
+            predict_new_business = st.form_submit_button(
+                "🔮 Predict New Business",
+                use_container_width=True,
+                help="Get ML prediction for your new business idea"
+            )
     
     # ML Prediction Section
     if predict_new_business:
@@ -744,268 +1238,111 @@ Think of it as having a crystal ball backed by real data!
                     )
                 
                 # Confidence and interpretation
-                confidence_color = "#00FF88" if prediction['confidence'] > 0.8 else "#FFD700" if prediction['confidence'] > 0.6 else "#FF6B6B"
-                
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, rgba(0, 0, 0, 0.95) 0%, rgba(20, 20, 20, 0.9) 50%, rgba(0, 0, 0, 0.95) 100%); 
-                            padding: 2.5rem; border-radius: 20px; margin: 2rem 0;
-                            border: 2px solid rgba(245, 232, 201, 0.5); 
-                            box-shadow: 0 20px 50px rgba(0, 0, 0, 0.8), 0 0 50px rgba(245, 232, 201, 0.3);
-                            backdrop-filter: blur(15px);
-                            position: relative;">
-                    <div style="position: absolute; top: 0; left: 0; right: 0; height: 4px;
-                                background: linear-gradient(90deg, #F5E8C9, #D4C8B0, #F5E8C9);
-                                background-size: 300% 100%; border-radius: 20px 20px 0 0;"></div>
-                    <h3 style="color: #F5E8C9; margin-bottom: 1.5rem; font-weight: 800; font-size: 1.6rem;
-                               display: flex; align-items: center; font-family: 'Inter', sans-serif;
-                               text-shadow: 0 0 20px rgba(245, 232, 201, 0.8); letter-spacing: 2px;">
-                        <span style="margin-right: 1rem; color: #F5E8C9;">🚀</span>
-                        <span style="background: linear-gradient(45deg, #F5E8C9, #D4C8B0);
-                                     -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text;">
-                            QUANTUM ANALYSIS: "{predict_business_name}"
-                        </span>
-                    </h3>
-                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1.5rem; margin-bottom: 1.5rem;">
-                        <div style="background: linear-gradient(135deg, rgba(245, 232, 201, 0.2) 0%, rgba(245, 232, 201, 0.1) 100%); 
-                                    padding: 1.5rem; border-radius: 12px; border: 2px solid rgba(245, 232, 201, 0.5);
-                                    box-shadow: 0 8px 25px rgba(245, 232, 201, 0.3);">
-                            <strong style="color: #F5E8C9; font-size: 1.1rem; font-family: 'Inter', sans-serif;
-                                           text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);">CONFIDENCE:</strong><br>
-                            <span style="color: {confidence_color}; font-weight: 800; font-size: 1.5rem;
-                                         font-family: 'Inter', sans-serif; text-shadow: 0 0 20px {confidence_color};
-                                         letter-spacing: 1px;">
-                                {prediction['confidence']:.1%} ({prediction['prediction_quality']})
-                            </span>
-                        </div>
-                        <div style="background: linear-gradient(135deg, rgba(245, 232, 201, 0.2) 0%, rgba(245, 232, 201, 0.1) 100%); 
-                                    padding: 1.5rem; border-radius: 12px; border: 2px solid rgba(245, 232, 201, 0.5);
-                                    box-shadow: 0 8px 25px rgba(245, 232, 201, 0.3);">
-                            <strong style="color: #F5E8C9; font-size: 1.1rem; font-family: 'Inter', sans-serif;
-                                           text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);">MARKET GAP:</strong><br>
-                            <span style="color: #F5E8C9; font-weight: 800; font-size: 1.5rem;
-                                         font-family: 'Inter', sans-serif; text-shadow: 0 0 20px rgba(245, 232, 201, 0.8);
-                                         letter-spacing: 1px;">
-                                {prediction['market_gap']} POINTS
-                            </span>
-                        </div>
-                    </div>
-                    <div style="background: linear-gradient(135deg, rgba(245, 232, 201, 0.2) 0%, rgba(245, 232, 201, 0.1) 100%); 
-                                padding: 1.5rem; border-radius: 12px; border: 2px solid rgba(245, 232, 201, 0.5); 
-                                margin-bottom: 1.5rem; box-shadow: 0 8px 25px rgba(245, 232, 201, 0.3);">
-                        <strong style="color: #F5E8C9; font-size: 1.1rem; font-family: 'Inter', sans-serif;
-                                       text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);">STELLAR ANALYSIS:</strong><br>
-                        <span style="color: #F5E8C9; font-weight: 400; font-size: 1.1rem; line-height: 1.6;
-                                     font-family: 'Inter', sans-serif; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">
-                            {prediction.get('interpretation', 'Analysis complete')}
-                        </span>
-                    </div>
-                    <div style="background: linear-gradient(135deg, rgba(245, 232, 201, 0.2) 0%, rgba(245, 232, 201, 0.1) 100%); 
-                                padding: 1.5rem; border-radius: 12px; border: 2px solid rgba(245, 232, 201, 0.5);
-                                box-shadow: 0 8px 25px rgba(245, 232, 201, 0.3);">
-                        <strong style="color: #F5E8C9; font-size: 1.1rem; font-family: 'Inter', sans-serif;
-                                       text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);">COSMIC RECOMMENDATION:</strong><br>
-                        <span style="color: #F5E8C9; font-weight: 400; font-size: 1.1rem; line-height: 1.6;
-                                     font-family: 'Inter', sans-serif; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">
-                            {prediction.get('recommendation', 'Consider market research')}
-                        </span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(render_prediction_card(
+                    predict_business_name,
+                    prediction['confidence'],
+                    prediction['prediction_quality'],
+                    prediction['market_gap'],
+                    prediction.get('interpretation', 'Analysis complete'),
+                    prediction.get('recommendation', 'Consider market research')
+                ), unsafe_allow_html=True)
         
         st.markdown("---")
     
-    # Display recommendations in main area
-    if get_recommendations or 'recommendations' not in st.session_state:
-        # Get recommendations
+    # Only recompute when asked with new inputs (or on first load); other reruns render the stored results
+    interests_key = tuple(sorted(selected_interests))
+    inputs = (selected_city, budget, interests_key, num_recommendations)
+    if 'last_results' not in st.session_state or (
+            get_recommendations and st.session_state.get('last_inputs') != inputs):
         with st.spinner("Analyzing business opportunities..."):
-            recommendations = engine.get_recommendations(
-                selected_city, budget, selected_interests, num_recommendations
-            )
-            st.session_state.recommendations = recommendations
-            st.session_state.last_city = selected_city
-            st.session_state.last_budget = budget
-            st.session_state.last_interests = selected_interests
+            st.session_state.last_results = {
+                'city': selected_city,
+                'budget': budget,
+                'recommendations': get_cached_recommendations(
+                    engine, selected_city, budget, interests_key, num_recommendations
+                ),
+                'category_data': get_cached_category_analysis(engine, selected_city),
+                'heatmap_data': create_opportunity_heatmap(engine, interests_key)
+            }
+        st.session_state.last_inputs = inputs
+    
+    results = st.session_state.last_results
+    recommendations = results['recommendations']
     
     # Display recommendations
-    if 'recommendations' in st.session_state:
-        recommendations = st.session_state.recommendations
+    if recommendations:
+        st.markdown('<div class="sub-header">🎯 Top Business Recommendations</div>', 
+                   unsafe_allow_html=True)
         
-        if recommendations:
-            st.markdown('<div class="sub-header">🎯 Top Business Recommendations</div>', 
-                       unsafe_allow_html=True)
-            
-            for i, rec in enumerate(recommendations, 1):
-                score_class = get_score_color_class(rec['score'])
-                
-                st.markdown(f"""
-                <div class="recommendation-card">
-                    <h3 style="color: #F5E8C9; margin-bottom: 0.8rem; font-family: 'Inter', sans-serif;
-                               text-shadow: 0 0 20px rgba(245, 232, 201, 0.8); letter-spacing: 1px;">
-                        {i}. {rec['business_name']} 
-                        <span style="font-size: 0.8em; color: #D4C8B0;">({rec['category']})</span>
-                    </h3>
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1.2rem;">
-                        <span style="font-size: 1.3rem; font-weight: 600; color: #F5E8C9; font-family: 'Inter', sans-serif;
-                                     text-shadow: 0 0 15px rgba(245, 232, 201, 0.6);">
-                            💰 Investment: {format_currency(rec['investment_required'])}
-                        </span>
-                        <span class="{score_class}" style="font-size: 1.3rem;">
-                            Score: {rec['score']}%
-                        </span>
-                    </div>
-                    <div style="margin-bottom: 1.2rem; color: #D4C8B0; font-family: 'Inter', sans-serif;
-                                text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">
-                        <strong>📈 Market Analysis:</strong> 
-                        Demand: {rec['demand']}% | Competition: {rec['competition']}% | 
-                        Market Gap: {rec['market_gap']:.1f} points
-                    </div>
-                    <div style="background: linear-gradient(135deg, rgba(245, 232, 201, 0.1) 0%, rgba(212, 200, 176, 0.1) 100%); 
-                                padding: 1.2rem; border-radius: 10px; border-left: 4px solid #F5E8C9;
-                                box-shadow: 0 8px 20px rgba(245, 232, 201, 0.2);">
-                        <strong style="color: #F5E8C9; font-family: 'Inter', sans-serif;
-                                       text-shadow: 0 0 15px rgba(245, 232, 201, 0.8);">💡 Business Intelligence:</strong><br>
-                        <span style="color: #F5E8C9; font-family: 'Inter', sans-serif; line-height: 1.6;
-                                     text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">{rec['explanation']}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.warning(f"No business opportunities found in {selected_city} matching your criteria.")
-            st.info("Try adjusting your budget or selecting different interests.")
-        # Budget analysis
-        if 'recommendations' in st.session_state:
-            st.markdown('<div class="sub-header">💰 Budget Analysis</div>', 
-                       unsafe_allow_html=True)
-            
-            recommendations = st.session_state.recommendations
-            if recommendations:
-                # Create budget fit chart
-                business_names = [rec['business_name'][:15] + "..." if len(rec['business_name']) > 15 
-                                else rec['business_name'] for rec in recommendations]
-                investments = [rec['investment_required'] for rec in recommendations]
-                budget_fits = [rec['budget_fit'] for rec in recommendations]
-                
-                fig = go.Figure()
-                
-                # Budget line
-                fig.add_hline(y=budget, line_dash="dash", line_color="#FF6B6B",
-                             annotation_text=f"Your Budget: {format_currency(budget)}")
-                
-                # Investment bars
-                fig.add_trace(go.Bar(
-                    x=business_names,
-                    y=investments,
-                    name="Required Investment",
-                    marker_color=['#00E5FF' if inv <= budget else '#FF6B6B' for inv in investments]
-                ))
-                
-                fig.update_layout(
-                    title="Investment vs Your Budget",
-                    xaxis_title="Business",
-                    yaxis_title="Amount (₹)",
-                    height=400,
-                    showlegend=False,
-                    plot_bgcolor='rgba(0, 0, 0, 0.9)',
-                    paper_bgcolor='rgba(0, 0, 0, 0.9)',
-                    font=dict(family='Inter', color='#F5E8C9')
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+        # Build every card first and send them in a single markdown element
+        card_html = []
+        for i, rec in enumerate(recommendations, 1):
+            card_html.append(_REC_CARD_TEMPLATE.format_map(
+                {**rec, 'rank': i, 'investment_str': rec['_investment_str'], 'score_class': rec['_score_class']}
+            ))
+        
+        st.markdown("\n".join(card_html), unsafe_allow_html=True)
+    else:
+        st.warning(f"No business opportunities found in {results['city']} matching your criteria.")
+        st.info("Try adjusting your budget or selecting different interests.")
+    # Budget analysis
+    st.markdown('<div class="sub-header">💰 Budget Analysis</div>', 
+               unsafe_allow_html=True)
     
-    # Market Analysis Section
-    if 'recommendations' in st.session_state and st.session_state.recommendations:
+    # Lay out every chart slot first, then fill each one as its figure is ready,
+    # so the page structure reaches the browser before any figure JSON
+    if recommendations:
+        category_data = results['category_data']
+        budget_slot = st.empty()
+        
+        # Market Analysis Section
         st.markdown('<div class="sub-header">📊 Market Analysis Dashboard</div>', 
                    unsafe_allow_html=True)
         
-        # Category analysis for the selected city
-        category_data = engine.get_category_analysis(selected_city)
-        
         if category_data:
             col3, col4 = st.columns(2)
-            
-            with col3:
-                # Market gap by category
-                categories = list(category_data.keys())
-                market_gaps = [category_data[cat]['market_gap'] for cat in categories]
-                
-                fig_gap = px.bar(
-                    x=categories,
-                    y=market_gaps,
-                    title=f"Market Opportunity by Category in {selected_city}",
-                    labels={'x': 'Category', 'y': 'Market Gap (Demand - Competition)'},
-                    color=market_gaps,
-                    color_continuous_scale=[[0, '#8B7D6B'], [0.5, '#D4C8B0'], [1, '#F5E8C9']]
-                )
-                fig_gap.update_layout(
-                    height=400, 
-                    showlegend=False,
-                    plot_bgcolor='rgba(0, 0, 0, 0.9)',
-                    paper_bgcolor='rgba(0, 0, 0, 0.9)',
-                    font=dict(family='Inter', color='#F5E8C9')
-                )
-                st.plotly_chart(fig_gap, width='stretch')
-            
-            with col4:
-                # Investment vs Business count
-                business_counts = [category_data[cat]['business_count'] for cat in categories]
-                avg_investments = [category_data[cat]['avg_investment'] for cat in categories]
-                
-                # Create DataFrame for scatter plot
-                scatter_df = pd.DataFrame({
-                    'Categories': categories,
-                    'Business_Count': business_counts,
-                    'Avg_Investment': avg_investments,
-                    'Market_Gap': market_gaps
-                })
-                
-                fig_scatter = px.scatter(
-                    scatter_df,
-                    x='Business_Count',
-                    y='Avg_Investment',
-                    size='Market_Gap',
-                    color='Categories',
-                    title="Investment vs Market Size by Category",
-                    labels={'Business_Count': 'Number of Businesses', 'Avg_Investment': 'Average Investment (₹)'},
-                    hover_data=['Categories', 'Market_Gap'],
-                    color_discrete_sequence=['#F5E8C9', '#D4C8B0', '#B8A890', '#A09078', '#8B7D6B', '#706550']
-                )
-                fig_scatter.update_layout(
-                    height=400,
-                    plot_bgcolor='rgba(0, 0, 0, 0.9)',
-                    paper_bgcolor='rgba(0, 0, 0, 0.9)',
-                    font=dict(family='Inter', color='#F5E8C9')
-                )
-                st.plotly_chart(fig_scatter, width='stretch')
+            # Market gap by category
+            gap_slot = col3.empty()
+            # Investment vs Business count
+            scatter_slot = col4.empty()
+        
+        # Figures are built (and Plotly imported) inside cached helpers keyed on their data
+        business_names, investments = zip(*(
+            (rec['_short_name'], rec['investment_required']) for rec in recommendations
+        ))
+        fig = budget_figure(business_names, investments, results['budget'])
+        budget_slot.plotly_chart(fig, width='stretch')
+        
+        # Category analysis for the searched city
+        if category_data:
+            categories = tuple(category_data.keys())
+            fig_gap, fig_scatter = category_figures(
+                results['city'],
+                categories,
+                tuple(category_data[cat]['market_gap'] for cat in categories),
+                tuple(category_data[cat]['business_count'] for cat in categories),
+                tuple(category_data[cat]['avg_investment'] for cat in categories)
+            )
+            gap_slot.plotly_chart(fig_gap, width='stretch')
+            scatter_slot.plotly_chart(fig_scatter, width='stretch')
     
     # Heatmap Section
-    if 'recommendations' in st.session_state and st.session_state.recommendations:
+    if recommendations:
         st.markdown('<div class="sub-header">🗺️ Opportunity Heatmap</div>', 
                    unsafe_allow_html=True)
         
-        # Create city-category heatmap
-        heatmap_data = create_opportunity_heatmap(engine, selected_interests)
+        # City-category heatmap for the searched interests
+        heatmap_data = results['heatmap_data']
         
         if not heatmap_data.empty:
-            fig_heatmap = px.imshow(
-                heatmap_data.values,
-                x=heatmap_data.columns,
-                y=heatmap_data.index,
-                color_continuous_scale=[[0, '#8B7D6B'], [0.5, '#D4C8B0'], [1, '#F5E8C9']],
-                title="Market Opportunity Heatmap (Top Cities vs Categories)",
-                labels=dict(x="Category", y="City", color="Market Score")
-            )
-            
-            fig_heatmap.update_layout(
-                height=600,
-                xaxis_title="Business Categories",
-                yaxis_title="Cities",
-                plot_bgcolor='rgba(0, 0, 0, 0.9)',
-                paper_bgcolor='rgba(0, 0, 0, 0.9)',
-                font=dict(family='Inter', color='#F5E8C9')
+            # Styled table instead of a Plotly heatmap: far smaller payload, no Plotly JS to evaluate
+            st.markdown("**Market Opportunity Heatmap (Top Cities vs Categories)**")
+            st.dataframe(
+                heatmap_data.style.apply(heatmap_cell_styles, axis=None).format('{:.1f}'),
+                width='stretch',
+                height=(len(heatmap_data) + 1) * 35 + 3
             )
             
-            st.plotly_chart(fig_heatmap, width='stretch')
-            
             # Add explanation
             st.info("💡 **How to read this heatmap:** Light areas indicate high opportunity (high demand, low competition), while darker areas suggest more competitive markets. Use this to identify the best city-category combinations.")
     
@@ -1026,23 +1363,14 @@ Think of it as having a crystal ball backed by real data!
     st.session_state.comparison_cities = comparison_cities
     
     if len(comparison_cities) >= 2:
-        comparison_data = []
-        for city in comparison_cities:
-            summary = engine.get_city_summary(city)
-            if summary:
-                comparison_data.append({
-                    'City': city,
-                    'Total Businesses': summary['total_businesses'],
-                    'Avg Demand': summary['avg_demand'],
-                    'Avg Competition': summary['avg_competition'],
-                    'Market Gap': round(summary['avg_demand'] - summary['avg_competition'], 1),
-                    'Avg Investment (₹L)': round(summary['avg_investment'] / 100000, 1),
-                    'Popular Category': summary['top_category']
-                })
+        # Rebuild the table only when the city selection changes
+        cities_key = tuple(comparison_cities)
+        if st.session_state.get('_cmp_key') != cities_key:
+            st.session_state._cmp_df = build_comparison_df(engine, cities_key)
+            st.session_state._cmp_key = cities_key
+        comparison_df = st.session_state._cmp_df
         
-        if comparison_data:
-            comparison_df = pd.DataFrame(comparison_data)
-            
+        if comparison_df is not None:
             # Display comparison table
             st.dataframe(
                 comparison_df.set_index('City'),
@@ -1050,64 +1378,18 @@ Think of it as having a crystal ball backed by real data!
             )
             
             # Create comparison charts
+            fig_demand_comp, fig_investment_comp = comparison_figures(comparison_df)
             col_comp1, col_comp2 = st.columns(2)
             
             with col_comp1:
-                fig_demand_comp = px.bar(
-                    comparison_df,
-                    x='City',
-                    y='Market Gap',
-                    title="Market Gap Comparison",
-                    color='Market Gap',
-                    color_continuous_scale=[[0, '#8B7D6B'], [0.5, '#D4C8B0'], [1, '#F5E8C9']]
-                )
-                fig_demand_comp.update_layout(
-                    height=400, 
-                    showlegend=False,
-                    plot_bgcolor='rgba(0, 0, 0, 0.9)',
-                    paper_bgcolor='rgba(0, 0, 0, 0.9)',
-                    font=dict(family='Inter', color='#F5E8C9')
-                )
                 st.plotly_chart(fig_demand_comp, width='stretch')
             
             with col_comp2:
-                fig_investment_comp = px.bar(
-                    comparison_df,
-                    x='City',
-                    y='Avg Investment (₹L)',
-                    title="Average Investment Comparison",
-                    color='Avg Investment (₹L)',
-                    color_continuous_scale=[[0, '#8B7D6B'], [1, '#F5E8C9']]
-                )
-                fig_investment_comp.update_layout(
-                    height=400, 
-                    showlegend=False,
-                    plot_bgcolor='rgba(0, 0, 0, 0.9)',
-                    paper_bgcolor='rgba(0, 0, 0, 0.9)',
-                    font=dict(family='Inter', color='#F5E8C9')
-                )
                 st.plotly_chart(fig_investment_comp, width='stretch')
     
     # Clean Professional Footer
     st.markdown("---")
-    st.markdown("""
-    <div class="footer-text">
-        <div style="display: flex; align-items: center; justify-content: center; margin-bottom: 0.5rem;">
-            <span style="font-size: 1.4rem; margin-right: 0.8rem;">🚀</span>
-            <strong style="color: #F5E8C9; font-family: 'Inter', sans-serif;
-                           font-weight: 600; letter-spacing: 0px; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">Business Intelligence</strong>
-        </div>
-        <div style="font-size: 0.9rem; opacity: 0.9; color: #D4C8B0; font-family: 'Inter', sans-serif;
-                    letter-spacing: 0px; text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);">
-            Advanced Analytics | Data Insights | Smart Decisions
-        </div>
-        <div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #F5E8C9;
-                    font-size: 0.8rem; color: #D4C8B0; font-family: 'Inter', sans-serif; text-shadow: 0 0 5px rgba(245, 232, 201, 0.3);">
-            <span style="opacity: 0.8;">Developed by</span> 
-            <strong style="color: #F5E8C9; font-weight: 500; text-shadow: 0 0 10px rgba(245, 232, 201, 0.5);">Sudev Basti</strong>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,12 +5,38 @@ Implements the core logic for recommending businesses based on user preferences
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Collection, List, Dict, Tuple, Optional
 import warnings
 import os
-from ml_predictor import MLPredictor
+from ml_predictor import MLPredictor, DATASET_DTYPES
 warnings.filterwarnings('ignore')
 
+# Directories searched for a relative dataset path, in order ("" is the working
+# directory; joining with os.getcwd() would only repeat these lookups)
+_DATASET_SEARCH_DIRS = (
+    "",
+    os.path.dirname(__file__),
+    os.path.dirname(os.path.dirname(__file__)),
+    "business-recommendation-system"
+)
+
+def _top_n_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Positions of the n largest values, largest first.
+    
+    Same result as Series.nlargest(n, keep='first'): ties keep their original
+    order. np.partition finds the n-th largest value in O(k), so only the rows
+    at or above it are sorted.
+    """
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n < len(values):
+        threshold = np.partition(values, len(values) - n)[len(values) - n]
+        candidates = np.flatnonzero(values >= threshold)
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind='stable')[:n]]
+
 class BusinessRecommendationEngine:
     """
     Core recommendation engine that processes business data and provides recommendations
@@ -28,16 +54,7 @@ class BusinessRecommendationEngine:
         # Handle relative paths for Streamlit deployment
         if not os.path.isabs(dataset_path):
             # Try to find the dataset file in common locations
-            possible_paths = [
-                dataset_path,
-                os.path.join(os.path.dirname(__file__), dataset_path),
-                os.path.join(os.path.dirname(os.path.dirname(__file__)), dataset_path),
-                os.path.join("business-recommendation-system", dataset_path),
-                os.path.join(os.getcwd(), dataset_path),
-                os.path.join(os.getcwd(), "business-recommendation-system", dataset_path)
-            ]
-            
-            for path in possible_paths:
+            for path in (os.path.join(directory, dataset_path) for directory in _DATASET_SEARCH_DIRS):
                 if os.path.exists(path):
                     self.dataset_path = path
                     break
@@ -58,13 +75,125 @@ class BusinessRecommendationEngine:
     def load_data(self) -> None:
         """Load the business dataset from CSV file."""
         try:
-            self.df = pd.read_csv(self.dataset_path)
+            self.df = pd.read_csv(self.dataset_path, usecols=list(DATASET_DTYPES), dtype=DATASET_DTYPES)
+            
+            # The dataset is immutable after loading, so the UI lookups are computed once.
+            # read_csv infers City/Category categories in sorted order, so the lists
+            # come straight from the dtypes
+            self._cities = self.df['City'].cat.categories.tolist()
+            self._categories = self.df['Category'].cat.categories.tolist()
+            self._inv_range = (int(self.df['Investment'].min()), int(self.df['Investment'].max()))
+            
+            # Lay rows out city by city (dataset order within a city), so a city is one contiguous slice
+            self.df = self.df.sort_values('City', kind='stable', ignore_index=True)
+            
+            self._build_cell_index()
+            self._build_category_analysis()
+            self._build_basic_predictions()
+            
+            # The normalized market gap only depends on the row, so compute it once
+            self.df['_market_gap'] = ((self._demand_vals - self._comp_vals + 100) / 200) * 100
+            
             print(f"✅ Dataset loaded successfully: {len(self.df)} businesses")
         except FileNotFoundError:
             raise FileNotFoundError(f"Dataset file not found: {self.dataset_path}")
         except Exception as e:
             raise Exception(f"Error loading dataset: {str(e)}")
     
+    def _build_cell_index(self) -> None:
+        """
+        Index row positions by (City, Category) cell and by City in CSR layout.
+        
+        Rows are stably sorted by cell id into one flat int32 permutation; the rows
+        of cell k are _row_perm[_cell_offsets[k]:_cell_offsets[k + 1]]. This replaces
+        two full-length boolean masks per lookup with a slice of one contiguous array.
+        The frame itself is sorted by City, so a city needs only its offsets.
+        """
+        self._city_pos = {city: i for i, city in enumerate(self._cities)}
+        self._category_pos = {category: i for i, category in enumerate(self._categories)}
+        n_cells = len(self._cities) * len(self._categories)
+        
+        city_codes = self.df['City'].cat.codes.to_numpy(dtype=np.int32)
+        category_codes = self.df['Category'].cat.codes.to_numpy(dtype=np.int32)
+        cell_ids = city_codes * len(self._categories) + category_codes
+        
+        self._row_perm = np.argsort(cell_ids, kind='stable').astype(np.int32)
+        self._cell_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(cell_ids, minlength=n_cells)))
+        ).astype(np.int32)
+        self._city_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(city_codes, minlength=len(self._cities))))
+        ).astype(np.int32)
+        # float64 copies so cell means accumulate at full precision
+        self._demand_vals = self.df['Demand'].to_numpy(dtype=np.float64)
+        self._comp_vals = self.df['Competition'].to_numpy(dtype=np.float64)
+    
+    def _build_category_analysis(self) -> None:
+        """
+        Precompute get_category_analysis for every city from the cell index.
+        
+        Means come from np.add.reduceat and investment extremes from
+        np.minimum/np.maximum.reduceat over the cell-sorted rows, so a query
+        is a dict lookup instead of a groupby.
+        """
+        counts = np.diff(self._cell_offsets)
+        cells = np.flatnonzero(counts)
+        starts = self._cell_offsets[cells]
+        counts = counts[cells]
+        
+        demand = self._demand_vals[self._row_perm]
+        competition = self._comp_vals[self._row_perm]
+        investment = self.df['Investment'].to_numpy()[self._row_perm]
+        
+        avg_demand = np.round(np.add.reduceat(demand, starts) / counts, 2)
+        avg_competition = np.round(np.add.reduceat(competition, starts) / counts, 2)
+        avg_investment = np.round(np.add.reduceat(investment.astype(np.float64), starts) / counts, 2)
+        min_investment = np.minimum.reduceat(investment, starts)
+        max_investment = np.maximum.reduceat(investment, starts)
+        market_gap = np.round(avg_demand - avg_competition, 2)
+        
+        self._category_analysis = {city: {} for city in self._cities}
+        n_categories = len(self._categories)
+        for cell, *stats in zip(cells.tolist(), avg_demand.tolist(), avg_competition.tolist(),
+                                avg_investment.tolist(), min_investment.tolist(),
+                                max_investment.tolist(), counts.tolist(), market_gap.tolist()):
+            city_pos, category_pos = divmod(cell, n_categories)
+            self._category_analysis[self._cities[city_pos]][self._categories[category_pos]] = dict(zip(
+                ('avg_demand', 'avg_competition', 'avg_investment', 'min_investment',
+                 'max_investment', 'business_count', 'market_gap'), stats
+            ))
+    
+    def _build_basic_predictions(self) -> None:
+        """
+        Precompute the (demand, competition) means behind _get_basic_prediction.
+        
+        Per-cell and per-category sums come from weighted np.bincount over the
+        codes, so a basic prediction is a dict lookup instead of a dataset scan.
+        """
+        category_codes = self.df['Category'].cat.codes.to_numpy(dtype=np.int64)
+        cell_ids = self.df['City'].cat.codes.to_numpy(dtype=np.int64) * len(self._categories) + category_codes
+        
+        self._cell_means = {}
+        self._category_means = {}
+        for means, ids, keys in [
+            (self._cell_means, cell_ids, [(city, category) for city in self._cities for category in self._categories]),
+            (self._category_means, category_codes, self._categories)
+        ]:
+            counts = np.bincount(ids, minlength=len(keys))
+            demand_sums = np.bincount(ids, weights=self._demand_vals, minlength=len(keys))
+            competition_sums = np.bincount(ids, weights=self._comp_vals, minlength=len(keys))
+            for key, count, demand_sum, competition_sum in zip(keys, counts.tolist(), demand_sums.tolist(),
+                                                               competition_sums.tolist()):
+                if count:
+                    means[key] = (demand_sum / count, competition_sum / count)
+    
+    def _city_rows(self, city: str) -> slice:
+        """Get the contiguous slice of rows for a city (empty if the city is unknown)."""
+        city_pos = self._city_pos.get(city)
+        if city_pos is None:
+            return slice(0, 0)
+        return slice(int(self._city_offsets[city_pos]), int(self._city_offsets[city_pos + 1]))
+    
     def _initialize_ml_predictor(self):
         """Initialize ML predictor for enhanced recommendations."""
         try:
@@ -83,15 +212,15 @@ class BusinessRecommendationEngine:
     
     def get_available_cities(self) -> List[str]:
         """Get list of available cities from the dataset."""
-        return sorted(self.df['City'].unique().tolist())
+        return self._cities
     
     def get_available_categories(self) -> List[str]:
         """Get list of available business categories from the dataset."""
-        return sorted(self.df['Category'].unique().tolist())
+        return self._categories
     
     def get_investment_range(self) -> Tuple[int, int]:
         """Get the minimum and maximum investment values from the dataset."""
-        return int(self.df['Investment'].min()), int(self.df['Investment'].max())
+        return self._inv_range
     
     def calculate_market_gap(self, demand: float, competition: float) -> float:
         """
@@ -130,12 +259,12 @@ class BusinessRecommendationEngine:
             fit_percentage = (user_budget / required_investment) * 100
             return min(fit_percentage, 100.0)
     
-    def calculate_interest_match(self, user_interests: List[str], business_category: str) -> float:
+    def calculate_interest_match(self, user_interests: Collection[str], business_category: str) -> float:
         """
         Calculate interest match score.
         
         Args:
-            user_interests (List[str]): List of user's interested categories
+            user_interests (Collection[str]): User's interested categories (a set gives O(1) lookups)
             business_category (str): Business category
             
         Returns:
@@ -171,6 +300,32 @@ class BusinessRecommendationEngine:
         
         return round(total_score, 2)
     
+    def _score_components(self, rows: slice, user_budget: float,
+                          user_interests: Collection[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized market gap, budget fit and interest match for a set of businesses.
+        
+        Array counterpart of calculate_market_gap, calculate_budget_fit and
+        calculate_interest_match, computed over whole columns at once.
+        
+        Args:
+            rows (slice): Rows of the businesses
+            user_budget (float): User's available budget
+            user_interests (Collection[str]): User's interested categories
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Market gap, budget fit and interest match scores
+        """
+        market_gap = self.df['_market_gap'].to_numpy()[rows]
+        investment = self.df['Investment'].to_numpy()[rows].astype(np.float64)
+        
+        with np.errstate(divide='ignore'):
+            budget_fit = np.minimum(user_budget / investment * 100, 100.0)
+        interest_codes = [self._category_pos[c] for c in user_interests if c in self._category_pos]
+        interest_match = np.isin(self.df['Category'].cat.codes.to_numpy()[rows], interest_codes) * 100.0
+        
+        return market_gap, budget_fit, interest_match
+    
     def get_score_explanation(self, row: pd.Series, user_budget: float, 
                             user_interests: List[str]) -> str:
         """
@@ -216,6 +371,37 @@ class BusinessRecommendationEngine:
         
         return " | ".join(explanations)
     
+    def _score_explanations(self, market_gap: np.ndarray, budget_fit: np.ndarray,
+                            interest_match: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_score_explanation over score component arrays.
+        
+        Args:
+            market_gap (np.ndarray): Market gap scores
+            budget_fit (np.ndarray): Budget fit scores
+            interest_match (np.ndarray): Interest match scores
+            
+        Returns:
+            np.ndarray: Explanation string per business
+        """
+        market_text = np.select(
+            [market_gap >= 70, market_gap >= 50],
+            ["🎯 High market opportunity (low competition, high demand)", "📈 Good market potential"],
+            default="⚠️ Competitive market"
+        )
+        budget_text = np.select(
+            [budget_fit == 100, budget_fit >= 80, budget_fit >= 50],
+            ["💰 Perfect budget fit", "💵 Good budget alignment", "💲 Moderate budget requirement"],
+            default="💸 High investment needed"
+        )
+        interest_text = np.where(interest_match == 100, "❤️ Matches your interests",
+                                 "🔍 Outside your preferred categories")
+        
+        explanations = market_text
+        for text in (budget_text, interest_text):
+            explanations = np.char.add(np.char.add(explanations, " | "), text)
+        return explanations
+    
     def get_recommendations(self, city: str, budget: float, interests: List[str], 
                           top_n: int = 3) -> List[Dict]:
         """
@@ -230,43 +416,39 @@ class BusinessRecommendationEngine:
         Returns:
             List[Dict]: List of recommended businesses with scores and explanations
         """
+        interests = frozenset(interests)
+        
         # Filter businesses by city
-        city_businesses = self.df[self.df['City'] == city].copy()
+        rows = self._city_rows(city)
         
-        if city_businesses.empty:
+        if rows.stop == rows.start:
             return []
         
         # Calculate scores for all businesses in the city
-        city_businesses['score'] = city_businesses.apply(
-            lambda row: self.calculate_total_score(row, budget, interests), axis=1
-        )
-        
-        # Add explanations
-        city_businesses['explanation'] = city_businesses.apply(
-            lambda row: self.get_score_explanation(row, budget, interests), axis=1
-        )
-        
-        # Sort by score and get top N
-        top_businesses = city_businesses.nlargest(top_n, 'score')
-        
-        # Convert to list of dictionaries
-        recommendations = []
-        for _, row in top_businesses.iterrows():
-            recommendation = {
-                'business_name': row['Business'],
-                'category': row['Category'],
-                'investment_required': row['Investment'],
-                'demand': row['Demand'],
-                'competition': row['Competition'],
-                'score': row['score'],
-                'explanation': row['explanation'],
-                'market_gap': self.calculate_market_gap(row['Demand'], row['Competition']),
-                'budget_fit': self.calculate_budget_fit(budget, row['Investment']),
-                'interest_match': self.calculate_interest_match(interests, row['Category'])
-            }
-            recommendations.append(recommendation)
-        
-        return recommendations
+        # Market gap: 50% weight, Budget fit: 30% weight, Interest match: 20% weight
+        market_gap, budget_fit, interest_match = self._score_components(rows, budget, interests)
+        score = np.round(market_gap * 0.5 + budget_fit * 0.3 + interest_match * 0.2, 2)
+        
+        # Get top N; only those rows are materialized and explained
+        top = _top_n_positions(score, top_n)
+        top_businesses = self.df.iloc[rows.start + top]
+        explanations = self._score_explanations(market_gap[top], budget_fit[top], interest_match[top])
+        
+        # Convert to list of dictionaries, zipping whole columns instead of iterating rows
+        columns = {
+            'business_name': top_businesses['Business'],
+            'category': top_businesses['Category'],
+            'investment_required': top_businesses['Investment'],
+            'demand': top_businesses['Demand'].astype(int),
+            'competition': top_businesses['Competition'].astype(int),
+            'score': score[top],
+            'explanation': explanations,
+            'market_gap': market_gap[top],
+            'budget_fit': budget_fit[top],
+            'interest_match': interest_match[top]
+        }
+        values = zip(*(column.tolist() for column in columns.values()))
+        return [dict(zip(columns, row)) for row in values]
     
     def get_city_summary(self, city: str) -> Dict:
         """
@@ -278,20 +460,31 @@ class BusinessRecommendationEngine:
         Returns:
             Dict: Summary statistics for the city
         """
-        city_data = self.df[self.df['City'] == city]
+        rows = self._city_rows(city)
         
-        if city_data.empty:
+        if rows.stop == rows.start:
             return {}
         
+        # Businesses per category come straight from the cell index offsets
+        n_categories = len(self._categories)
+        first_cell = self._city_pos[city] * n_categories
+        category_counts = np.diff(self._cell_offsets[first_cell:first_cell + n_categories + 1])
+        investment = self.df['Investment'].to_numpy()[rows]
+        
+        # Ties go to the category that appears first in the dataset, as with
+        # value_counts on the raw column (a cell's first row is its first position)
+        tied = np.flatnonzero(category_counts == category_counts.max())
+        top_category = tied[self._row_perm[self._cell_offsets[first_cell + tied]].argmin()]
+        
         summary = {
-            'total_businesses': len(city_data),
-            'categories': city_data['Category'].nunique(),
-            'avg_demand': round(city_data['Demand'].mean(), 1),
-            'avg_competition': round(city_data['Competition'].mean(), 1),
-            'min_investment': city_data['Investment'].min(),
-            'max_investment': city_data['Investment'].max(),
-            'avg_investment': round(city_data['Investment'].mean(), 0),
-            'top_category': city_data['Category'].value_counts().index[0]
+            'total_businesses': rows.stop - rows.start,
+            'categories': int(np.count_nonzero(category_counts)),
+            'avg_demand': round(float(self._demand_vals[rows].mean()), 1),
+            'avg_competition': round(float(self._comp_vals[rows].mean()), 1),
+            'min_investment': int(investment.min()),
+            'max_investment': int(investment.max()),
+            'avg_investment': round(float(investment.mean()), 0),
+            'top_category': self._categories[int(top_category)]
         }
         
         return summary
@@ -306,27 +499,7 @@ class BusinessRecommendationEngine:
         Returns:
             Dict: Category analysis data
         """
-        city_data = self.df[self.df['City'] == city]
-        
-        category_stats = city_data.groupby('Category').agg({
-            'Demand': 'mean',
-            'Competition': 'mean',
-            'Investment': ['mean', 'min', 'max'],
-            'Business': 'count'
-        }).round(2)
-        
-        # Flatten column names
-        category_stats.columns = [
-            'avg_demand', 'avg_competition', 'avg_investment', 
-            'min_investment', 'max_investment', 'business_count'
-        ]
-        
-        # Calculate market gap for each category
-        category_stats['market_gap'] = (
-            category_stats['avg_demand'] - category_stats['avg_competition']
-        ).round(2)
-        
-        return category_stats.to_dict('index')
+        return self._category_analysis.get(city, {})
     
     def predict_new_business_opportunity(self, city: str, category: str, 
                                        business_name: str, investment: float) -> Dict:
@@ -342,36 +515,56 @@ class BusinessRecommendationEngine:
         Returns:
             Dict: Prediction results with demand, competition, and market analysis
         """
+        return self.predict_new_business_opportunities([(city, category, business_name, investment)])[0]
+    
+    def predict_new_business_opportunities(self, candidates: List[Tuple[str, str, str, float]]) -> List[Dict]:
+        """
+        Predict market opportunity for several new businesses using ML.
+        
+        The candidates share one feature matrix and one predict call per model;
+        a lone candidate takes the predictor's single-row path, which is cheaper.
+        
+        Args:
+            candidates (List[Tuple[str, str, str, float]]): (city, category,
+                business_name, investment) per business
+            
+        Returns:
+            List[Dict]: Prediction results, in the same order as candidates
+        """
         if not self.use_ml or self.ml_predictor is None:
-            return self._get_basic_prediction(city, category)
+            return [self._get_basic_prediction(city, category) for city, category, _, _ in candidates]
         
         try:
-            prediction = self.ml_predictor.predict_single_business(
-                city, category, business_name, investment
-            )
+            if len(candidates) == 1:
+                predictions = [self.ml_predictor.predict_single_business(*candidates[0])]
+            else:
+                predictions = self.ml_predictor.predict_batch([
+                    {'city': city, 'category': category, 'business': business_name, 'investment': investment}
+                    for city, category, business_name, investment in candidates
+                ])
             
-            # Add interpretation
-            prediction['interpretation'] = self._interpret_ml_prediction(prediction)
-            prediction['recommendation'] = self._get_business_recommendation(prediction)
+            # Add interpretation for all predictions at once
+            demand, competition, confidence, market_gap = (
+                np.array([prediction[key] for prediction in predictions], dtype=np.float64)
+                for key in ('demand', 'competition', 'confidence', 'market_gap')
+            )
+            interpretations = self._interpret_ml_predictions(market_gap, confidence).tolist()
+            recommendations = self._get_business_recommendations(demand, competition, confidence).tolist()
+            for prediction, interpretation, recommendation in zip(predictions, interpretations, recommendations):
+                prediction['interpretation'] = interpretation
+                prediction['recommendation'] = recommendation
             
-            return prediction
+            return predictions
             
         except Exception as e:
             print(f"⚠️ ML prediction failed: {str(e)}")
-            return self._get_basic_prediction(city, category)
+            return [self._get_basic_prediction(city, category) for city, category, _, _ in candidates]
     
     def _get_basic_prediction(self, city: str, category: str) -> Dict:
         """Get basic prediction without ML."""
-        city_data = self.df[(self.df['City'] == city) & (self.df['Category'] == category)]
-        
-        if city_data.empty:
-            # Use category averages
-            category_data = self.df[self.df['Category'] == category]
-            avg_demand = category_data['Demand'].mean() if not category_data.empty else 70
-            avg_competition = category_data['Competition'].mean() if not category_data.empty else 50
-        else:
-            avg_demand = city_data['Demand'].mean()
-            avg_competition = city_data['Competition'].mean()
+        # Fall back to category averages when the city has no such businesses
+        means = self._cell_means.get((city, category)) or self._category_means.get(category)
+        avg_demand, avg_competition = means if means else (70, 50)
         
         return {
             'demand': round(avg_demand, 1),
@@ -383,32 +576,37 @@ class BusinessRecommendationEngine:
     
     def _interpret_ml_prediction(self, prediction: Dict) -> str:
         """Interpret ML prediction results."""
-        market_gap = prediction['market_gap']
-        confidence = prediction['confidence']
-        
-        if market_gap > 20 and confidence > 0.8:
-            return "🚀 Excellent opportunity with high confidence"
-        elif market_gap > 15 and confidence > 0.7:
-            return "📈 Good opportunity with solid predictions"
-        elif market_gap > 5:
-            return "📊 Moderate opportunity, consider market research"
-        else:
-            return "⚠️ Challenging market, high competition expected"
+        return str(self._interpret_ml_predictions(
+            np.array([prediction['market_gap']]), np.array([prediction['confidence']])
+        )[0])
+    
+    def _interpret_ml_predictions(self, market_gap: np.ndarray, confidence: np.ndarray) -> np.ndarray:
+        """Interpret a batch of ML predictions in one np.select pass."""
+        return np.select(
+            [(market_gap > 20) & (confidence > 0.8), (market_gap > 15) & (confidence > 0.7), market_gap > 5],
+            ["🚀 Excellent opportunity with high confidence",
+             "📈 Good opportunity with solid predictions",
+             "📊 Moderate opportunity, consider market research"],
+            default="⚠️ Challenging market, high competition expected"
+        )
     
     def _get_business_recommendation(self, prediction: Dict) -> str:
         """Get business recommendation based on prediction."""
-        demand = prediction['demand']
-        competition = prediction['competition']
-        confidence = prediction['confidence']
-        
-        if demand > 80 and competition < 40:
-            return "🎯 Highly recommended - High demand, low competition"
-        elif demand > 70 and competition < 60:
-            return "👍 Recommended - Good market potential"
-        elif confidence < 0.6:
-            return "🔍 Needs more research - Low prediction confidence"
-        else:
-            return "⚠️ Proceed with caution - Competitive market"
+        return str(self._get_business_recommendations(
+            np.array([prediction['demand']]), np.array([prediction['competition']]),
+            np.array([prediction['confidence']])
+        )[0])
+    
+    def _get_business_recommendations(self, demand: np.ndarray, competition: np.ndarray,
+                                      confidence: np.ndarray) -> np.ndarray:
+        """Get business recommendations for a batch of predictions in one np.select pass."""
+        return np.select(
+            [(demand > 80) & (competition < 40), (demand > 70) & (competition < 60), confidence < 0.6],
+            ["🎯 Highly recommended - High demand, low competition",
+             "👍 Recommended - Good market potential",
+             "🔍 Needs more research - Low prediction confidence"],
+            default="⚠️ Proceed with caution - Competitive market"
+        )
 
 # Test the recommendation engine
 if __name__ == "__main__":